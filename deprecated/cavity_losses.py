@@ -36,7 +36,7 @@ def get_electric_energy_in_volume(calcobject: CalcObject, volume: str) -> float:
     return UE.evaluate() / 2
 
 
-@dataclass
+@dataclass(slots=True)
 class ModeQualityFactors:
     """Quality factors associated with a specific mode"""
     bare_HFSS: Optional[float] = None
@@ -193,8 +193,7 @@ class QualityFactors:
             self.quality_factors[mode_name].mode_volume_cm3_max_method = mode_volume
 
             # mode volume - (total magnetic energy)^2 divided total(magnetic energy squared)
-            squared_magnetic_field = vecH.dot(vecB.conj()).real()
-            total_squared_magnetic_field = squared_magnetic_field.integrate_vol(name=volume).evaluate()
+            total_squared_magnetic_field = 2 * UH_total
             total_quadrupled_magnetic_field = (squared_magnetic_field * squared_magnetic_field).integrate_vol(
                 name=volume).evaluate()
             mode_volume = ((total_squared_magnetic_field ** 2) / total_quadrupled_magnetic_field) * 1e6  # to cm^3
@@ -1,2 +1,2 @@
-from .formatter import apply_format, apply_format_single, apply_format_single_dict, apply_format_dict
+from .formatter import apply_format, apply_format_single, apply_format_single_dict, apply_format_dict, apply_format_dataframe
 from .simulation import analyze
@@ -1,6 +1,7 @@
 from ..simulation_basics import SimulationResult
 from typing import Dict, Tuple, List
 import numpy as np
+import pandas as pd
 from functools import reduce
 
 
@@ -9,16 +10,27 @@ FREQ = 'Freq. (GHz)'
 LIFETIME = 'Lifetime (us)'
 
 
-def _convert_modes_to_labels(data: Dict, modes_to_labels: Dict[int, str]):
-    """For each mode in the mapping we replace the data with its name.
+def _flatten_with_labels(data: Dict, label_items: List[Tuple[int, str]],
+                         keys_by_title: Dict[str, List[Tuple[int, str]]]) -> Dict:
+    """For each mode in the mapping we replace the data with its name and flatten it.
     Also removes any mode that do not appear in the `modes_to_labels` mapping.
+    The flat keys of each title are formatted once and kept in `keys_by_title` for the next results.
     """
     result = {}
-    for k, v in data.items():
-        result[k] = {label: v[mode] for mode, label in modes_to_labels.items()}
+    for title, title_data in data.items():
+        keys = keys_by_title.get(title)
+        if keys is None:
+            keys = keys_by_title[title] = [(mode, f'{label} {title}') for mode, label in label_items]
+        for mode, key in keys:
+            result[key] = title_data[mode]
     return result
 
 
+def _label_items(modes_to_labels: Dict[int, str] = None) -> List[Tuple[int, str]]:
+    # the (mode, label) pairs are computed once per batch of results
+    return list(modes_to_labels.items()) if modes_to_labels else []
+
+
 def _add_lifetime_column(data: Dict):
     # first making sure that the length for frequency and quality factor is the same
     assert len(data[QF]) == len(data[FREQ])
@@ -36,19 +48,43 @@ def _flatten(data: Dict):
 
 
 def _sort_dict(data: Dict):
-    return {k: data[k] for k in sorted(data.keys())}
+    return dict(sorted(data.items()))
 
 
-def apply_format_single_dict(data: Dict, modes_to_labels: Dict[int, str] = None) -> Dict:
+def _format_single_dict(data: Dict, label_items: List[Tuple[int, str]],
+                        keys_by_title: Dict[str, List[Tuple[int, str]]]) -> Dict:
     _add_lifetime_column(data)
-    if modes_to_labels:
-        data = _convert_modes_to_labels(data, modes_to_labels)
-    data = _flatten(data)
+    if label_items:
+        data = _flatten_with_labels(data, label_items, keys_by_title)
+    else:
+        data = _flatten(data)
     return _sort_dict(data)
 
 
+def apply_format_single_dict(data: Dict, modes_to_labels: Dict[int, str] = None) -> Dict:
+    return _format_single_dict(data, _label_items(modes_to_labels), {})
+
+
 def apply_format_dict(data: List[Dict], modes_to_labels: Dict[int, str] = None) -> List[Dict]:
-    return list(map(lambda x: apply_format_single_dict(x, modes_to_labels), data))
+    label_items, keys_by_title = _label_items(modes_to_labels), {}
+    return [_format_single_dict(x, label_items, keys_by_title) for x in data]
+
+
+def apply_format_dataframe(data: List[Dict], modes_to_labels: Dict[int, str] = None) -> pd.DataFrame:
+    """Same as `apply_format_dict`, but the whole batch is formatted in pandas into a single DataFrame
+    (a row per result). The given results are not modified."""
+    # rows of (result index, mode) and a column per title
+    df = pd.concat({i: pd.DataFrame(x) for i, x in enumerate(data)})
+    df[LIFETIME] = df[QF] / (2 * np.pi * df[FREQ] * 1e3)
+
+    if modes_to_labels:
+        df = df.loc[(slice(None), list(modes_to_labels)), :]
+        df = df.rename(index=modes_to_labels, level=1)
+
+    # a column per (title, label)
+    df = df.unstack(level=1)
+    df.columns = [f'{label} {title}' for title, label in df.columns]
+    return df.sort_index(axis=1).reset_index(drop=True)
 
 
 def apply_format_single(data: SimulationResult, modes_to_labels: Dict[int, str] = None) -> SimulationResult:
@@ -60,4 +96,6 @@ def apply_format_single(data: SimulationResult, modes_to_labels: Dict[int, str]
 
 def apply_format(data: List[SimulationResult],
                  modes_to_labels: Dict[int, str] = None) -> List[SimulationResult]:
-    return list(map(lambda x: apply_format_single(x, modes_to_labels), data))
+    label_items, keys_by_title = _label_items(modes_to_labels), {}
+    return [SimulationResult(result=_format_single_dict(x.result, label_items, keys_by_title),
+                             snapshot=x.snapshot) for x in data]
@@ -23,6 +23,8 @@ NAME_PATTERN = r'(?P<name>[\w\$_\d]+)'
 UNIT_PATTERN = r'(?P<unit>\w*)'
 SPLIT_PATTERN = r'[-+\/*()]+'
 PATTERN_FOR_VARIATION = Pattern(rf"{NAME_PATTERN}='{VALUE_PATTERN}{UNIT_PATTERN}'")
+PATTERN_FOR_VALUE = Pattern(rf'^\s*{VALUE_PATTERN}{UNIT_PATTERN}\s*$')
+PATTERN_FOR_SPLIT = Pattern(SPLIT_PATTERN)
 
 
 def match_to_valued_variable(match: re.Match) -> Optional[ValuedVariable]:
@@ -48,23 +50,16 @@ def dict_to_valued_variable(data: Dict[str, str]) -> Optional[ValuedVariable]:
 def text_to_valued_variables(text: str) -> Tuple[ValuedVariable, ...]:
     """string to a tuple of valued variables.
     returns sorted valued variables """
-    def _helper():
-        for m in PATTERN_FOR_VARIATION.compiled.finditer(text):
-            yield match_to_valued_variable(m)
-
-    return sort_valued_variables(_helper())
+    return sort_valued_variables(map(match_to_valued_variable, PATTERN_FOR_VARIATION.compiled.finditer(text)))
 
 
 def dict_to_valued_variables(data: Dict[str, str]) -> Tuple[ValuedVariable, ...]:
 
-    pattern = Pattern(f'^\s*{VALUE_PATTERN}{UNIT_PATTERN}\s*$')
-    split_pattern = Pattern(f'{SPLIT_PATTERN}')
-
     def _helper():
         for k, v in data.items():
-            # clauses = split_pattern.compiled.split(v)
-            # matches = list(map(lambda x: pattern.compiled.match(x), clauses))
-            m = pattern.compiled.match(v)
+            # clauses = PATTERN_FOR_SPLIT.compiled.split(v)
+            # matches = list(map(lambda x: PATTERN_FOR_VALUE.compiled.match(x), clauses))
+            m = PATTERN_FOR_VALUE.compiled.match(v)
             # if None in matches:
             if not m:
                 continue
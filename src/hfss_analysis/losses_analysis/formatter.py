@@ -23,7 +23,7 @@ def _flatten(data: Dict):
 
 
 def _sort_dict(data: Dict):
-    return {k: data[k] for k in sorted(data.keys())}
+    return dict(sorted(data.items()))
 
 
 def apply_format_single_dict(data: Dict, modes_to_labels: Dict[int, str] = None) -> Dict:
@@ -34,7 +34,7 @@ def apply_format_single_dict(data: Dict, modes_to_labels: Dict[int, str] = None)
 
 
 def apply_format_dict(data: List[Dict], modes_to_labels: Dict[int, str] = None) -> List[Dict]:
-    return list(map(lambda x: apply_format_single_dict(x, modes_to_labels), data))
+    return [apply_format_single_dict(x, modes_to_labels) for x in data]
 
 
 def apply_format_single(data: SimulationResult, modes_to_labels: Dict[int, str] = None) -> SimulationResult:
@@ -46,4 +46,4 @@ def apply_format_single(data: SimulationResult, modes_to_labels: Dict[int, str]
 
 def apply_format(data: List[SimulationResult],
                  modes_to_labels: Dict[int, str] = None) -> List[SimulationResult]:
-    return list(map(lambda x: apply_format_single(x, modes_to_labels), data))
+    return [apply_format_single(x, modes_to_labels) for x in data]
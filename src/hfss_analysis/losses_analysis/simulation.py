@@ -10,7 +10,10 @@ Supported loss channels:
     TODO add external coupling quality factors.
 """
 
-from typing import List, Optional, Literal, Tuple
+import logging
+from abc import ABC, abstractmethod
+from functools import reduce
+from typing import Dict, Iterable, List, Optional, Literal, Tuple
 from pyEPR.core_distributed_analysis import CalcObject
 from ..hfss_project import Project
 from ..simulation_basics import SimulationResult
@@ -20,6 +23,8 @@ import numpy as np
 from scipy.constants import epsilon_0
 from tqdm import tqdm
 
+logger = logging.getLogger(__name__)
+
 
 Q_SEAM_LOSS = 'Q seam loss'
 G_FACTOR = 'G-factor (Ohm)'
@@ -29,28 +34,62 @@ MODE_VOLUME_MAGNETIC = 'Mode volume (cm^3) using magnetic field'
 Q_SURFACES_LOSS = 'Q surfaces loss'
 Q_BULK_LOSS = 'Q bulk loss'
 
+# electric energies evaluated by the field calculator, keyed by (snapshot, mode, volume).
+# the same dict can be passed (as `energy_cache`) to several loss analyses of the same solutions so the shared
+# integrals are evaluated once. it is only valid as long as the solutions are not recomputed
+ElectricEnergyCache = Dict[Tuple[Tuple[ValuedVariable, ...], int, str], float]
 
-def get_electric_energy_in_volume(calcobject: CalcObject, volume: str) -> float:
+COORDINATE_TO_SCALAR = {
+    'x': lambda x: x.scalar_x(),
+    'y': lambda x: x.scalar_y(),
+    'z': lambda x: x.scalar_z()
+}
+
+
+def _progress(modes: List[int]) -> Iterable[int]:
+    """Wrap the modes with a progress bar, unless there is only a single mode to go over."""
+    return tqdm(modes) if len(modes) > 1 else modes
+
+
+def _build_e_exprs(calcobject: CalcObject) -> Tuple[CalcObject, CalcObject, CalcObject]:
+    """The electric field, the displacement field and the real part of their (conjugated) dot product."""
     vecE = calcobject.getQty("E").smooth()
     vecD = vecE.times_eps()
-    E_squared = vecD.dot(vecE.conj()).real()
+    E_squared = vecE.dot(vecD.conj()).real()
+    return vecE, vecD, E_squared
+
+
+def _evaluate_electric_energy(E_squared: CalcObject, volume: str) -> float:
     UE = E_squared.integrate_vol(name=volume)
     return UE.evaluate() / 2
 
 
-class LossSimulation:
+def get_electric_energy_in_volume(calcobject: CalcObject, volume: str) -> float:
+    _, _, E_squared = _build_e_exprs(calcobject)
+    return _evaluate_electric_energy(E_squared, volume)
+
+
+class LossSimulation(ABC):
     """Calculate and save the quality factors corresponding to different loss mechanisms."""
 
-    def __init__(self, project: Project, modes: Optional[List[int]] = None, volume: str = 'AllObjects'):
+    _progress_description = 'Calculating losses'
+
+    def __init__(self, project: Project, modes: Optional[List[int]] = None, volume: str = 'AllObjects',
+                 *, energy_cache: Optional[ElectricEnergyCache] = None):
         r"""
         :param volume: string with the name of the volume in which the EM field lives in HFSS.
+        :param energy_cache: optional dict shared with other loss analyses of the same solutions
+            (see `ElectricEnergyCache`). If not given, the energies are always evaluated.
         """
         self.project = project
+        self.energy_cache = energy_cache
         self.modes = modes or list(range(int(self.project.setup.n_modes)))
         self.volume = volume
         self.snapshots: Optional[List[Tuple[ValuedVariable, ...]]] = None
         self.variations: Optional[List[str]] = None
         self.results = []
+        # frequencies (GHz) of the modes, read from HFSS once per snapshot
+        self._frequencies: Dict[Tuple[ValuedVariable, ...], Dict[int, float]] = {}
 
     def _clear(self):
         self.results = []
@@ -58,16 +97,72 @@ class LossSimulation:
 
     def _prepare_snapshots_and_variations(self, sweep: Optional[Sweep] = None,
                                           variation_chooser: Literal['all', 'current'] = 'current'):
+        # every access to the property queries HFSS for the current variations
+        inverse_variation_dict = self.project.inverse_variation_dict
+
         if sweep:
             self.snapshots = sweep.snapshots
         elif variation_chooser == 'current':
             self.snapshots = [self.project.get_snapshot()]
         elif variation_chooser == 'all':
-            self.snapshots = list(self.project.inverse_variation_dict.keys())
+            self.snapshots = list(inverse_variation_dict.keys())
         else:
             raise ValueError
 
-        self.variations = [self.project.inverse_variation_dict[snapshot] for snapshot in self.snapshots]
+        self.variations = [inverse_variation_dict[snapshot] for snapshot in self.snapshots]
+        self._frequencies = {}
+
+    def _get_angular_frequency(self, snapshot: Tuple[ValuedVariable, ...], mode: int) -> float:
+        if snapshot not in self._frequencies:
+            self._frequencies[snapshot] = self.project.get_analysis_results(snapshot)['Freq. (GHz)'].to_dict()
+        return 2 * np.pi * self._frequencies[snapshot][mode] * 1e9
+
+    def analysis(self, sweep: Optional[Sweep] = None,
+                 variation_chooser: Literal['all', 'current'] = 'current') -> List[SimulationResult]:
+
+        self._prepare_snapshots_and_variations(sweep=sweep, variation_chooser=variation_chooser)
+
+        for snapshot in self.snapshots:
+            self.project.set_variables(snapshot)
+
+            # the calculator object only builds expressions (each operation returns a new object),
+            # hence it can be shared by all modes
+            calcobject = CalcObject([], self.project.setup)
+
+            snapshot_results_dict = {}
+            for mode in (pbar := _progress(self.modes)):
+                if isinstance(pbar, tqdm):
+                    pbar.set_description(f'{self._progress_description} for mode {mode}')
+                self.project.distributed_analysis.set_mode(mode)
+
+                for title, value in self._analyze_mode(calcobject, snapshot, mode).items():
+                    snapshot_results_dict.setdefault(title, {})[mode] = value
+
+            self.results.append(snapshot_results_dict)
+
+        return [SimulationResult(result=result, snapshot=snapshot)
+                for snapshot, result in zip(self.snapshots, self.results)]
+
+    @abstractmethod
+    def _analyze_mode(self, calcobject: CalcObject, snapshot: Tuple[ValuedVariable, ...],
+                      mode: int) -> Dict[str, float]:
+        """Calculate the results of the mode currently set in HFSS, keyed by their title.
+        Each mode is analyzed on its own, since HFSS keeps a single active mode for the field calculator.
+        """
+
+    def _get_electric_energy(self, E_squared: CalcObject, snapshot: Tuple[ValuedVariable, ...],
+                             mode: int, volume: str) -> float:
+        """Electric energy of the current mode in the volume, given the mode's Re(E.D*) expression
+        (see `_build_e_exprs`).
+        If an energy cache was given, the value is kept in it, so other loss analyses sharing it reuse it.
+        """
+        if self.energy_cache is None:
+            return _evaluate_electric_energy(E_squared, volume)
+
+        key = (snapshot, mode, volume)
+        if key not in self.energy_cache:
+            self.energy_cache[key] = _evaluate_electric_energy(E_squared, volume)
+        return self.energy_cache[key]
 
 
 class SeamLossSimulation(LossSimulation):
@@ -80,6 +175,8 @@ class SeamLossSimulation(LossSimulation):
     See T. Brecht's thesis.
     """
 
+    _progress_description = 'Calculating seam loss'
+
     def __init__(self, project: Project,
                  seam_line: str,
                  g_seam: float = 1e6,
@@ -90,60 +187,38 @@ class SeamLossSimulation(LossSimulation):
         :param seam_line: string with the name of the seam line in HFSS.
         :param coordinate_perp_to_line: The coordinate perpendicular to the seam line.
         """
+        if coordinate_perp_to_line not in COORDINATE_TO_SCALAR:
+            raise ValueError(f'{coordinate_perp_to_line=}')
+
         super().__init__(project, modes)
         self.seam_line = seam_line
         self.g_seam = g_seam
         self.coordinate_perp_to_line = coordinate_perp_to_line
 
-    def analysis(self, sweep: Optional[Sweep] = None,
-                 variation_chooser: Literal['all', 'current'] = 'current') -> List[SimulationResult]:
+    def _analyze_mode(self, calcobject: CalcObject, snapshot: Tuple[ValuedVariable, ...],
+                      mode: int) -> Dict[str, float]:
+        omega = self._get_angular_frequency(snapshot, mode)
 
-        self._prepare_snapshots_and_variations(sweep=sweep, variation_chooser=variation_chooser)
+        j_surf = COORDINATE_TO_SCALAR[self.coordinate_perp_to_line](calcobject.getQty("Jsurf")).smooth()
 
-        for snapshot in self.snapshots:
-            self.project.set_variables(snapshot)
-
-            snapshot_results_dict = {}
-            for mode in (pbar := tqdm(self.modes)):
-                pbar.set_description(f"Calculating seam loss for mode {mode}")
-                self.project.distributed_analysis.set_mode(mode)
-
-                omega = 2 * np.pi * self.project.get_analysis_results(snapshot).loc[mode, 'Freq. (GHz)'] * 1e9
-
-                calcobject = CalcObject([], self.project.setup)
+        # j_surf_conj = j_surf.conj()
+        j_surf = j_surf.__mul__(j_surf.conj()).real()
+        # j_surf = j_surf.real()
+        int_j_surf = j_surf.integrate_line(name=self.seam_line)
+        int_j_surf = int_j_surf.evaluate()
 
-                if self.coordinate_perp_to_line == 'x':
-                    j_surf = calcobject.getQty("Jsurf").scalar_x().smooth()
-                elif self.coordinate_perp_to_line == 'y':
-                    j_surf = calcobject.getQty("Jsurf").scalar_y().smooth()
-                elif self.coordinate_perp_to_line == 'z':
-                    j_surf = calcobject.getQty("Jsurf").scalar_z().smooth()
-                else:
-                    raise ValueError(f'{self.coordinate_perp_to_line=}')
+        vecH = calcobject.getQty("H").smooth()
+        vecB = vecH.times_mu()
+        squared_magnetic_field = vecH.dot(vecB.conj()).real()
+        UH = squared_magnetic_field.integrate_vol(name=self.volume)
+        UH = UH.evaluate()
 
-                # j_surf_conj = j_surf.conj()
-                j_surf = j_surf.__mul__(j_surf.conj()).real()
-                # j_surf = j_surf.real()
-                int_j_surf = j_surf.integrate_line(name=self.seam_line)
-                int_j_surf = int_j_surf.evaluate()
+        y_seam = int_j_surf / (UH * omega)
+        logger.debug('y_seam = %.2e /(Ω*m)', y_seam)
 
-                vecH = calcobject.getQty("H").smooth()
-                vecB = vecH.times_mu()
-                squared_magnetic_field = vecH.dot(vecB.conj()).real()
-                UH = squared_magnetic_field.integrate_vol(name=self.volume)
-                UH = UH.evaluate()
-
-                y_seam = int_j_surf / (UH * omega)
-                print(f'y_seam = {y_seam:.2e} /(Ω*m)')
-
-                Q_seam = self.g_seam / y_seam
-                print(f'Q_seam = {Q_seam:.2e}')
-                snapshot_results_dict[mode] = Q_seam
-
-            self.results.append(snapshot_results_dict)
-
-        return [SimulationResult(result={Q_SEAM_LOSS: result}, snapshot=snapshot)
-                for snapshot, result in zip(self.snapshots, self.results)]
+        Q_seam = self.g_seam / y_seam
+        logger.debug('Q_seam = %.2e', Q_seam)
+        return {Q_SEAM_LOSS: Q_seam}
 
 
 class GeometryAndFillingFactorsSimulation(LossSimulation):
@@ -170,80 +245,70 @@ class GeometryAndFillingFactorsSimulation(LossSimulation):
         https://optics.ansys.com/hc/en-us/articles/360034395374-Calculating-the-modal-volume-of-a-cavity-mode.
     """
 
+    _progress_description = 'Calculating G- and F-factors'
+
     def __init__(self, project: Project,
                  epsilon_r: float = 33, t_h: float = 5e-9,
-                 modes: Optional[List[int]] = None):
+                 modes: Optional[List[int]] = None,
+                 *, check_energy_balance: bool = True,
+                 energy_cache: Optional[ElectricEnergyCache] = None):
         r"""
         :param epsilon_r: relative permittivity of the dielectrics covering the surface.
         :param t_h: thickness of the dielectrics covering the surface.
+        :param check_energy_balance: assert that the total electric and magnetic energies agree (within 1%).
 
         :return factors: a list with the G and F factors of the modes, alternately.
         """
-        super().__init__(project, modes)
+        super().__init__(project, modes, energy_cache=energy_cache)
         self.epsilon_r = epsilon_r
         self.t_h = t_h
-
-    def analysis(self, sweep: Optional[Sweep] = None,
-                 variation_chooser: Literal['all', 'current'] = 'current') -> List[SimulationResult]:
-
-        self._prepare_snapshots_and_variations(sweep=sweep, variation_chooser=variation_chooser)
-
-        for snapshot in self.snapshots:
-            self.project.set_variables(snapshot)
-
-            snapshot_results_dict = {G_FACTOR: {}, F_FACTOR: {}, MODE_VOLUME_MAX: {}, MODE_VOLUME_MAGNETIC: {}}
-            for mode in (pbar := tqdm(self.modes)):
-                pbar.set_description(f'Calculating G- and F-factors for mode {mode}')
-                self.project.distributed_analysis.set_mode(mode)
-
-                omega = 2 * np.pi * self.project.get_analysis_results(snapshot).loc[mode, 'Freq. (GHz)'] * 1e9
-
-                calcobject = CalcObject([], self.project.setup)
-
-                # G Factor
-                vecH = calcobject.getQty("H").smooth()
-                vecB = vecH.times_mu()
-                squared_magnetic_field = vecH.dot(vecB.conj()).real()
-                UH_total = squared_magnetic_field.integrate_vol(name=self.volume).evaluate() * 0.5
-
-                H_surface = vecH.dot(vecH.conj()).real().integrate_surf(name=self.volume)
-                H_surface = H_surface.evaluate() * 0.5
-                G = omega * (UH_total / H_surface)
-                print(f'Geometry factor, G = {G:.2f} Ω')
-                snapshot_results_dict[G_FACTOR][mode] = G
-
-                # F Factor
-                UE_total = get_electric_energy_in_volume(calcobject=calcobject, volume=self.volume)
-                assert np.allclose(UE_total, UH_total, rtol=0.01)
-                vecE = calcobject.getQty("E").smooth()
-                vecD = vecE.times_eps()
-                E_squared = vecE.dot(vecD.conj()).real()
-                E_surface = E_squared.integrate_surf(name=self.volume).evaluate() / self.epsilon_r
-                UE_surface = 0.5 * self.t_h * E_surface
-                F = UE_surface / UE_total
-                print(f'Filling factor, F = {F:.3}')
-                snapshot_results_dict[F_FACTOR][mode] = F
-
-                # mode volume - total energy divided by its maximum
-                max_field = E_squared.maximum_vol(name=self.volume)
-                max_energy_value = max_field.evaluate() / 2  # Convert to energy
-                mode_volume = (UE_total / max_energy_value) * 1e6  # to cm^3
-                print(f'Mode volume using max amplitude method = {mode_volume:.3} cm^3')
-                snapshot_results_dict[MODE_VOLUME_MAX][mode] = mode_volume
-
-                # mode volume - (total magnetic energy)^2 divided total(magnetic energy squared)
-                squared_magnetic_field = vecH.dot(vecB.conj()).real()
-                total_squared_magnetic_field = squared_magnetic_field.integrate_vol(name=self.volume).evaluate()
-                total_quadrupled_magnetic_field = (squared_magnetic_field * squared_magnetic_field).integrate_vol(
-                    name=self.volume).evaluate()
-                mode_volume = ((total_squared_magnetic_field ** 2) / total_quadrupled_magnetic_field) * 1e6  # to cm^3
-                print(f'Mode volume using magnetic field method = {mode_volume:.3} cm^3')
-                snapshot_results_dict[MODE_VOLUME_MAGNETIC][mode] = mode_volume
-
-            self.results.append(snapshot_results_dict)
-
-        return [SimulationResult(result=result, snapshot=snapshot)
-                for snapshot, result in zip(self.snapshots, self.results)]
+        self.check_energy_balance = check_energy_balance
+
+    def _analyze_mode(self, calcobject: CalcObject, snapshot: Tuple[ValuedVariable, ...],
+                      mode: int) -> Dict[str, float]:
+        results = {}
+
+        omega = self._get_angular_frequency(snapshot, mode)
+
+        # G Factor
+        vecH = calcobject.getQty("H").smooth()
+        vecB = vecH.times_mu()
+        squared_magnetic_field = vecH.dot(vecB.conj()).real()
+        total_squared_magnetic_field = squared_magnetic_field.integrate_vol(name=self.volume).evaluate()
+        UH_total = total_squared_magnetic_field * 0.5
+
+        H_surface = vecH.dot(vecH.conj()).real().integrate_surf(name=self.volume)
+        H_surface = H_surface.evaluate() * 0.5
+        G = omega * (UH_total / H_surface)
+        logger.debug('Geometry factor, G = %.2f Ω', G)
+        results[G_FACTOR] = G
+
+        # F Factor
+        _, _, E_squared = _build_e_exprs(calcobject)
+        UE_total = self._get_electric_energy(E_squared, snapshot, mode, self.volume)
+        if self.check_energy_balance:
+            assert np.allclose(UE_total, UH_total, rtol=0.01)
+        E_surface = E_squared.integrate_surf(name=self.volume).evaluate() / self.epsilon_r
+        UE_surface = 0.5 * self.t_h * E_surface
+        F = UE_surface / UE_total
+        logger.debug('Filling factor, F = %.3g', F)
+        results[F_FACTOR] = F
+
+        # mode volume - total energy divided by its maximum
+        max_field = E_squared.maximum_vol(name=self.volume)
+        max_energy_value = max_field.evaluate() / 2  # Convert to energy
+        mode_volume = (UE_total / max_energy_value) * 1e6  # to cm^3
+        logger.debug('Mode volume using max amplitude method = %.3g cm^3', mode_volume)
+        results[MODE_VOLUME_MAX] = mode_volume
+
+        # mode volume - (total magnetic energy)^2 divided total(magnetic energy squared)
+        total_quadrupled_magnetic_field = (squared_magnetic_field * squared_magnetic_field).integrate_vol(
+            name=self.volume).evaluate()
+        mode_volume = ((total_squared_magnetic_field ** 2) / total_quadrupled_magnetic_field) * 1e6  # to cm^3
+        logger.debug('Mode volume using magnetic field method = %.3g cm^3', mode_volume)
+        results[MODE_VOLUME_MAGNETIC] = mode_volume
+
+        return results
 
 
 class SurfaceLossSimulation(LossSimulation):
@@ -267,11 +332,14 @@ class SurfaceLossSimulation(LossSimulation):
     and $\tan \delta_{SA} = 2.2 \times 10^{-3}$.
     """
 
+    _progress_description = 'Calculating surface losses'
+
     def __init__(self, project: Project,
                  metal_surfaces, substrate,
                  epsilon_r: float = 10, t: float = 3e-9,
                  tan_MA=2.1 * 1e-2, tan_MS=2.6 * 1e-3, tan_SA=2.2 * 1e-3,
-                 modes: Optional[List[int]] = None):
+                 modes: Optional[List[int]] = None,
+                 *, energy_cache: Optional[ElectricEnergyCache] = None):
         r"""
         :param epsilon_r: relative permittivity of the dielectrics covering the surface.
         :param t: thickness of the dielectrics covering the surfaces.
@@ -286,7 +354,7 @@ class SurfaceLossSimulation(LossSimulation):
 
         :return:
         """
-        super().__init__(project, modes)
+        super().__init__(project, modes, energy_cache=energy_cache)
         self.metal_surfaces = metal_surfaces
         self.substrate = substrate
         self.epsilon_r = epsilon_r
@@ -295,72 +363,57 @@ class SurfaceLossSimulation(LossSimulation):
         self.tan_MS = tan_MS
         self.tan_SA = tan_SA
 
-    def analysis(self, sweep: Optional[Sweep] = None,
-                 variation_chooser: Literal['all', 'current'] = 'current') -> List[SimulationResult]:
+    def _analyze_mode(self, calcobject: CalcObject, snapshot: Tuple[ValuedVariable, ...],
+                      mode: int) -> Dict[str, float]:
+        vecE, _, E_squared = _build_e_exprs(calcobject)
+        UE_total = self._get_electric_energy(E_squared, snapshot, mode, self.volume)
 
-        self._prepare_snapshots_and_variations(sweep=sweep, variation_chooser=variation_chooser)
+        # MA/MS participation ratio
+        # the integrals over all the metal surfaces are summed by the field calculator and evaluated at once
+        metal_surface_integrals = []
+        for metal_surface in self.metal_surfaces:
+            # normal to surface
+            vecE_normal = vecE.normal2surface(metal_surface)
+            vecD_normal = vecE_normal.__mul__(epsilon_0 / self.epsilon_r)
 
-        for snapshot in self.snapshots:
-            self.project.set_variables(snapshot)
+            # tangent to surface
+            vecE_tangent = vecE.tangent2surface(metal_surface)
+            vecD_tangent = vecE_tangent.__mul__(self.epsilon_r * epsilon_0)
 
-            snapshot_results_dict = {}
-            for mode in (pbar := tqdm(self.modes)):
-                pbar.set_description(f'Calculating surface losses for mode {mode}')
-                self.project.distributed_analysis.set_mode(mode)
+            E_squared = ((vecE_normal.dot(vecD_normal.conj())).__add__(
+                (vecE_tangent.dot(vecD_tangent.conj())))).real()
+            metal_surface_integrals.append(E_squared.integrate_surf(name=metal_surface))
 
-                calcobject = CalcObject([], self.project.setup)
-
-                UE_total = get_electric_energy_in_volume(calcobject=calcobject, volume=self.volume)
-                vecE = calcobject.getQty("E").smooth()
-
-                # MA/MS participation ratio
-                E_surface_metal = 0
-                for metal_surface in self.metal_surfaces:
-                    # normal to surface
-                    vecE_normal = vecE.normal2surface(metal_surface)
-                    vecD_normal = vecE_normal.__mul__(epsilon_0 / self.epsilon_r)
-                    E_squared = (vecE_normal.dot(vecD_normal.conj())).real()
-                    E_surface_metal += E_squared.integrate_surf(name=metal_surface).evaluate() / 2
-
-                    # tangent to surface
-                    vecE_tangent = vecE.tangent2surface(metal_surface)
-                    vecD_tangent = vecE_tangent.__mul__(self.epsilon_r * epsilon_0)
-                    E_squared = (vecE_tangent.dot(vecD_tangent.conj())).real()
-                    E_surface_metal += E_squared.integrate_surf(name=metal_surface).evaluate() / 2
-
-                p_metal = (self.t * E_surface_metal) / UE_total
-                print(f'Metal-Air/Metal-Substrate participation ratio, p_MA = p_MS = {p_metal:.3}')
-
-                # SA participation ratio
-                vecE_normal = vecE.normal2surface(self.substrate).__mul__(epsilon_0 / self.epsilon_r)
-                vecD_normal = vecE.normal2surface(self.substrate)
-                vecE_tangent = vecE.tangent2surface(self.substrate)
-                vecD_tangent = vecE.tangent2surface(self.substrate).__mul__(epsilon_0 * self.epsilon_r)
-                E_squared = ((vecE_normal.dot(vecD_normal.conj())).__add__(
-                    (vecE_tangent.dot(vecD_tangent.conj())))).real()
-                E_surface = E_squared.integrate_surf(name=self.substrate).evaluate() / 2
-                E_surface_substrate = E_surface - E_surface_metal
-
-                p_SA = (self.t * E_surface_substrate) / UE_total
-                print(f'Air-Substrate participation ratio, p_SA = {p_SA:.3}')
-
-                # upper bounds
-                Q_MA = 1 / (p_metal * self.tan_MA)
-                Q_MS = 1 / (p_metal * self.tan_MS)
-                Q_SA = 1 / (p_SA * self.tan_SA)
-                Q_surface_total = 1 / (1 / Q_MA + 1 / Q_MS + 1 / Q_SA)
-
-                print(f'Quality factor due to MA loss = {Q_MA:.3}')
-                print(f'Quality factor due to MS loss = {Q_MS:.3}')
-                print(f'Quality factor due to SA loss = {Q_SA:.3}')
-                print(f'Quality factor due to all surface losses = {Q_surface_total:.3}')
-
-                snapshot_results_dict[mode] = Q_surface_total
+        E_surface_metal = reduce(lambda x, y: x.__add__(y), metal_surface_integrals).evaluate() / 2
 
-            self.results.append(snapshot_results_dict)
+        p_metal = (self.t * E_surface_metal) / UE_total
+        logger.debug('Metal-Air/Metal-Substrate participation ratio, p_MA = p_MS = %.3g', p_metal)
 
-        return [SimulationResult(result={Q_SURFACES_LOSS: result}, snapshot=snapshot)
-                for snapshot, result in zip(self.snapshots, self.results)]
+        # SA participation ratio
+        vecE_normal = vecE.normal2surface(self.substrate)
+        vecD_normal = vecE_normal.__mul__(epsilon_0 / self.epsilon_r)
+        vecE_tangent = vecE.tangent2surface(self.substrate)
+        vecD_tangent = vecE_tangent.__mul__(epsilon_0 * self.epsilon_r)
+        E_squared = ((vecE_normal.dot(vecD_normal.conj())).__add__(
+            (vecE_tangent.dot(vecD_tangent.conj())))).real()
+        E_surface = E_squared.integrate_surf(name=self.substrate).evaluate() / 2
+        E_surface_substrate = E_surface - E_surface_metal
+
+        p_SA = (self.t * E_surface_substrate) / UE_total
+        logger.debug('Air-Substrate participation ratio, p_SA = %.3g', p_SA)
+
+        # upper bounds
+        Q_MA = 1 / (p_metal * self.tan_MA)
+        Q_MS = 1 / (p_metal * self.tan_MS)
+        Q_SA = 1 / (p_SA * self.tan_SA)
+        Q_surface_total = 1 / (1 / Q_MA + 1 / Q_MS + 1 / Q_SA)
+
+        logger.debug('Quality factor due to MA loss = %.3g', Q_MA)
+        logger.debug('Quality factor due to MS loss = %.3g', Q_MS)
+        logger.debug('Quality factor due to SA loss = %.3g', Q_SA)
+        logger.debug('Quality factor due to all surface losses = %.3g', Q_surface_total)
+
+        return {Q_SURFACES_LOSS: Q_surface_total}
 
 
 class BulkLossSimulation(LossSimulation):
@@ -371,45 +424,31 @@ class BulkLossSimulation(LossSimulation):
         See https://arxiv.org/abs/2206.14334 for details and a measured value for EFG sapphire loss tangent (62e-9).
     """
 
+    _progress_description = 'Calculating bulk loss'
+
     def __init__(self, project: Project,
                  bulk: str, loss_tangent: float,
-                 modes: Optional[List[int]] = None):
+                 modes: Optional[List[int]] = None,
+                 *, energy_cache: Optional[ElectricEnergyCache] = None):
         r"""
         :param bulk: string with the name of the bulk (usually the chip substrate) in which the losses occur.
         :param loss_tangent: the loss tangent of the bulk.
         """
-        super().__init__(project, modes)
+        super().__init__(project, modes, energy_cache=energy_cache)
         self.bulk = bulk
         self.loss_tangent = loss_tangent
 
-    def analysis(self, sweep: Optional[Sweep] = None,
-                 variation_chooser: Literal['all', 'current'] = 'current') -> List[SimulationResult]:
+    def _analyze_mode(self, calcobject: CalcObject, snapshot: Tuple[ValuedVariable, ...],
+                      mode: int) -> Dict[str, float]:
+        _, _, E_squared = _build_e_exprs(calcobject)
+        total_UE = self._get_electric_energy(E_squared, snapshot, mode, self.volume)
+        bulk_UE = self._get_electric_energy(E_squared, snapshot, mode, self.bulk)
+        p_bulk = bulk_UE / total_UE
 
-        self._prepare_snapshots_and_variations(sweep=sweep, variation_chooser=variation_chooser)
+        bulk_Q_factor = 1 / (p_bulk * self.loss_tangent)
 
-        for snapshot in self.snapshots:
-            self.project.set_variables(snapshot)
-
-            snapshot_results_dict = {}
-            for mode in (pbar := tqdm(self.modes)):
-                pbar.set_description(f'Calculating bulk loss for mode {mode}')
-                self.project.distributed_analysis.set_mode(mode)
-
-                calcobject = CalcObject([], self.project.setup)
-
-                total_UE = get_electric_energy_in_volume(calcobject=calcobject, volume=self.volume)
-                bulk_UE = get_electric_energy_in_volume(calcobject=calcobject, volume=self.bulk)
-                p_bulk = bulk_UE / total_UE
-
-                bulk_Q_factor = 1 / (p_bulk * self.loss_tangent)
-
-                print(f'Quality factor of mode {mode} due to bulk loss in {self.bulk} = {bulk_Q_factor:.2g}')
-                snapshot_results_dict[mode] = bulk_Q_factor
-
-            self.results.append(snapshot_results_dict)
-
-        return [SimulationResult(result={Q_BULK_LOSS: result}, snapshot=snapshot)
-                for snapshot, result in zip(self.snapshots, self.results)]
+        logger.debug('Quality factor of mode %s due to bulk loss in %s = %.2g', mode, self.bulk, bulk_Q_factor)
+        return {Q_BULK_LOSS: bulk_Q_factor}
 
 
 def analyze_seam_loss(project: Project,
@@ -427,10 +466,14 @@ def analyze_seam_loss(project: Project,
 def analyze_geometry_and_filling_factors(project: Project,
                                          epsilon_r: float = 33, t_h: float = 5e-9,
                                          modes: Optional[List[int]] = None, sweep: Optional[Sweep] = None,
-                                         variation_chooser: Literal['all', 'current'] = 'current'
+                                         variation_chooser: Literal['all', 'current'] = 'current',
+                                         *, check_energy_balance: bool = True,
+                                         energy_cache: Optional[ElectricEnergyCache] = None
                                          ) -> List[SimulationResult]:
 
-    sim = GeometryAndFillingFactorsSimulation(project=project, modes=modes, epsilon_r=epsilon_r, t_h=t_h)
+    sim = GeometryAndFillingFactorsSimulation(project=project, modes=modes, epsilon_r=epsilon_r, t_h=t_h,
+                                              check_energy_balance=check_energy_balance,
+                                              energy_cache=energy_cache)
     return sim.analysis(sweep, variation_chooser)
 
 
@@ -439,20 +482,24 @@ def analyze_surface_loss(project: Project,
                          epsilon_r: float = 10, t: float = 3e-9,
                          tan_MA=2.1 * 1e-2, tan_MS=2.6 * 1e-3, tan_SA=2.2 * 1e-3,
                          modes: Optional[List[int]] = None, sweep: Optional[Sweep] = None,
-                         variation_chooser: Literal['all', 'current'] = 'current'
+                         variation_chooser: Literal['all', 'current'] = 'current',
+                         *, energy_cache: Optional[ElectricEnergyCache] = None
                          ) -> List[SimulationResult]:
     sim = SurfaceLossSimulation(project=project, modes=modes,
                                 metal_surfaces=metal_surfaces, substrate=substrate,
                                 epsilon_r=epsilon_r, t=t,
-                                tan_MA=tan_MA, tan_MS=tan_MS, tan_SA=tan_SA)
+                                tan_MA=tan_MA, tan_MS=tan_MS, tan_SA=tan_SA,
+                                energy_cache=energy_cache)
     return sim.analysis(sweep, variation_chooser)
 
 
 def analyze_bulk_loss(project: Project,
                       bulk: str, loss_tangent: float,
                       modes: Optional[List[int]] = None, sweep: Optional[Sweep] = None,
-                      variation_chooser: Literal['all', 'current'] = 'current'
+                      variation_chooser: Literal['all', 'current'] = 'current',
+                      *, energy_cache: Optional[ElectricEnergyCache] = None
                       ) -> List[SimulationResult]:
     sim = BulkLossSimulation(project=project, modes=modes,
-                             bulk=bulk, loss_tangent=loss_tangent)
+                             bulk=bulk, loss_tangent=loss_tangent,
+                             energy_cache=energy_cache)
     return sim.analysis(sweep, variation_chooser)
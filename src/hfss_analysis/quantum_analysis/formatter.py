@@ -1,6 +1,7 @@
-from typing import Dict, Tuple, List, Iterable
-import pandas as pd
+from dataclasses import dataclass
 from itertools import combinations_with_replacement
+from typing import Dict, Tuple, List, Iterable, Union
+import pandas as pd
 from ..simulation_basics import SimulationResult
 import numpy as np
 from numpy.typing import NDArray
@@ -11,84 +12,90 @@ class Constants:
     COUPLING = 'Coupling'
 
 
-def _get_chis(data: Dict) -> NDArray:
-    return np.real(data['chi_ND'])
+@dataclass(frozen=True, slots=True)
+class _Keys:
+    """The keys of the formatted results, by mode order (computed once per batch)"""
+    chis: Dict[Tuple[int, int], str]
+    frequencies: List[str]
 
 
-def _get_frequencies(data: Dict) -> NDArray:
-    return np.real(data['f_ND'])
+def _get_chis(data: Dict) -> NDArray:
+    # the raw results hold pandas objects, they are converted once instead of being indexed per element
+    return np.real(np.asarray(data['chi_ND']))
 
 
-def _sequential_mode_to_label(modes_to_labels: Dict[int, str]) -> Dict[int, str]:
-    """Simply convert the modes numbers in the dict to sequential array.
-    e.g.:
-        input:  {0: 'transmon', 2: 'readout', 4: 'cavity'}
-        output: {0: 'transmon', 1: 'readout', 2: 'cavity'}
-    """
-    return {i: modes_to_labels[k] for i, k in enumerate(modes_to_labels.keys())}
+def _get_frequencies(data: Dict) -> NDArray:
+    return np.real(np.asarray(data['f_ND']))
 
 
-def _flatten_chis(chis: NDArray) -> Dict[Tuple[int, int], float]:
+def _flatten_chis(chis: Union[NDArray, pd.DataFrame]) -> Dict[Tuple[int, int], float]:
     """
     Assuming the chi matrix is a symmetric matrix, hence we only want 2-combinations
     with replacements
-    :param chis: dataframe symmetric matrix NxN
+    :param chis: array or dataframe symmetric matrix NxN
     :return: a dictionary where the keys are the combinations of the modes
     """
+    chis = np.asarray(chis)
     assert chis.shape[0] == chis.shape[1]
 
-    def _helper():
-        for i, j in combinations_with_replacement(range(chis.shape[0]), r=2):
-            yield (i, j), chis[i][j]
+    rows, columns = np.triu_indices_from(chis)
+    return dict(zip(zip(rows.tolist(), columns.tolist()), chis[rows, columns].tolist()))
 
-    return {k: v for k, v in _helper()}
 
+def _format_chis(flat_chi: Dict[Tuple[int, int], float], keys: _Keys, out: Dict[str, float]):
+    for i_j, v in flat_chi.items():
+        out[keys.chis[i_j]] = v
 
-def _apply_mode_to_label_on_flatten_chi(flat_chi: Dict[Tuple[int, int], float],
-                                        modes_to_labels: Dict[int, str]):
 
-    def _format_key(t: Tuple[int, int]):
-        if t[0] == t[1]:
-            names = modes_to_labels[t[0]]
-            suffix = Constants.ANHARMONICITY
-        else:
-            names = f'{modes_to_labels[t[0]]} - {modes_to_labels[t[1]]}'
-            suffix = Constants.COUPLING
-        return f'{names} {suffix} (MHz)'
+def _format_frequencies(frequencies: NDArray, keys: _Keys, out: Dict[str, float]):
+    for i, freq in enumerate((frequencies / 1e3).tolist()):
+        out[keys.frequencies[i]] = freq
 
-    return {_format_key(k): v for k, v in flat_chi.items()}
 
+def _labels_by_mode_order(modes_to_labels: Dict[int, str]) -> List[str]:
+    """The labels by the order of the modes in the results.
+    e.g.:
+        input:  {0: 'transmon', 2: 'readout', 4: 'cavity'}
+        output: ['transmon', 'readout', 'cavity']
+    """
+    return list(modes_to_labels.values())
 
-def _format_frequencies(frequencies: NDArray, modes_to_labels: Dict[int, str]) -> Dict[str, float]:
-
-    def _format_value(freq: float):
-        return freq / 1e3
 
-    def _format_key(s: str):
-        return f'{s} ND Freq. (GHz)'
+def _keys_by_mode_order(modes_to_labels: Dict[int, str]) -> _Keys:
+    labels = _labels_by_mode_order(modes_to_labels)
+    anharmonicity, coupling = Constants.ANHARMONICITY, Constants.COUPLING
+    return _Keys(
+        # the diagonal are the anharmonicities and the rest are the couplings
+        chis={(i, j): f'{labels[i]} {anharmonicity} (MHz)' if i == j else
+              f'{labels[i]} - {labels[j]} {coupling} (MHz)'
+              for i, j in combinations_with_replacement(range(len(labels)), 2)},
+        frequencies=[f'{label} ND Freq. (GHz)' for label in labels]
+    )
 
-    return {_format_key(modes_to_labels[i]): _format_value(freq)
-            for i, freq in enumerate(frequencies)}
 
-
-def apply_format_single_dict(data: Dict, modes_to_labels: Dict[int, str]):
-    modes_to_labels = _sequential_mode_to_label(modes_to_labels)
+def _format_single_dict(data: Dict, keys: _Keys) -> Dict:
+    # both the chis and the frequencies are written into the same dict
+    result = {}
 
     # formatting chis
     chis = _get_chis(data)
     chis = _flatten_chis(chis)
-    chis = _apply_mode_to_label_on_flatten_chi(chis, modes_to_labels)
+    _format_chis(chis, keys, result)
 
     # formatting frequencies
     frequencies = _get_frequencies(data)
-    frequencies = _format_frequencies(frequencies, modes_to_labels)
+    _format_frequencies(frequencies, keys, result)
+
+    return result
 
-    # joining them to one dict and return
-    return dict(**chis, **frequencies)
+
+def apply_format_single_dict(data: Dict, modes_to_labels: Dict[int, str]):
+    return _format_single_dict(data, _keys_by_mode_order(modes_to_labels))
 
 
 def apply_format_dict(data: Iterable[Dict], modes_to_labels: Dict[int, str] = None) -> List[Dict]:
-    return list(map(lambda x: apply_format_single_dict(x, modes_to_labels), data))
+    keys = _keys_by_mode_order(modes_to_labels)
+    return [_format_single_dict(x, keys) for x in data]
 
 
 def apply_format_single(data: SimulationResult, modes_to_labels: Dict[int, str] = None) -> SimulationResult:
@@ -100,4 +107,5 @@ def apply_format_single(data: SimulationResult, modes_to_labels: Dict[int, str]
 
 def apply_format(data: List[SimulationResult],
                  modes_to_labels: Dict[int, str] = None) -> List[SimulationResult]:
-    return list(map(lambda x: apply_format_single(x, modes_to_labels), data))
+    keys = _keys_by_mode_order(modes_to_labels)
+    return [SimulationResult(result=_format_single_dict(x.result, keys), snapshot=x.snapshot) for x in data]
@@ -21,16 +21,19 @@ class QuantumSimulation:
 
     def _prepare_snapshots_and_variations(self, sweep: Optional[Sweep] = None,
                                           variation_chooser: Literal['all', 'current'] = 'current'):
+        # every access to the property queries HFSS for the current variations
+        inverse_variation_dict = self.project.inverse_variation_dict
+
         if sweep:
             self.snapshots = sweep.snapshots
         elif variation_chooser == 'current':
             self.snapshots = [self.project.get_snapshot()]
         elif variation_chooser == 'all':
-            self.snapshots = list(self.project.inverse_variation_dict.keys())
+            self.snapshots = list(inverse_variation_dict.keys())
         else:
             raise ValueError
 
-        self.variations = [self.project.inverse_variation_dict[snapshot] for snapshot in self.snapshots]
+        self.variations = [inverse_variation_dict[snapshot] for snapshot in self.snapshots]
 
     def _prepare_quantum_analysis(self) -> epr.QuantumAnalysis:
 
@@ -1,4 +1,8 @@
+import csv
 import json
+import os
+from collections import Counter
+from itertools import chain
 from dataclasses import dataclass, asdict
 from pathlib import Path
 from typing import Dict, Tuple, List, Union
@@ -10,16 +14,25 @@ from ..variables.variables import ValuedVariable, snapshot_to_dict
 
 
 def json_save(path, data, indent: int = 4):
-    s = json.dumps(data)
     with open(path, 'w') as f:
         json.dump(data, f, indent=indent)
 
 
+def _is_missing(value) -> bool:
+    # any scalar missing value (None, NaN of any float type, pd.NA, pd.NaT)
+    return pd.api.types.is_scalar(value) and pd.isna(value)
+
+
+def _csv_row(row: Dict) -> Dict:
+    # missing values are written as empty cells (like pandas does), any other value is written as it is
+    # (e.g. a sweep of [8, 8.5] is written as 8 and 8.5, the way the values are set in HFSS)
+    return {k: '' if _is_missing(v) else v for k, v in row.items()}
+
+
 def _remove_extention_from_path(path: Path):
-    parent = path.parent
-    while len(path.suffixes) > 0:
-        path = Path(path.stem)
-    return parent / path
+    # removing all the suffixes at once (e.g. 'results.tar.gz' -> 'results')
+    suffixes = ''.join(path.suffixes)
+    return path.parent / path.name[:len(path.name) - len(suffixes)]
 
 
 def _normalize_input_to_path(path_input: Union[str, Path]) -> Path:
@@ -38,7 +51,7 @@ def process_path(path: Union[str, Path]):
     return path
 
 
-@dataclass
+@dataclass(slots=True)
 class JointSimulationResults:
     results: List[SimulationResult]
     constant_variables: Tuple[ValuedVariable, ...]
@@ -57,34 +70,68 @@ class JointSimulationResults:
         #                   path as Path object without suffix)
         path = process_path(path)
 
-        # saving data
-        df = pd.DataFrame(data)
+        # saving data row by row, the columns are the union of all the rows' keys (in order of appearance)
+        fieldnames = list(dict.fromkeys(chain.from_iterable(data)))
         csv_path = Path(path).with_suffix('.csv')
-        df.to_csv(csv_path, index=False)
+        with open(csv_path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames, restval='', lineterminator=os.linesep)
+            writer.writeheader()
+            writer.writerows(map(_csv_row, data))
 
-        # saving constants
+        self._save_constants(path, constants)
+
+    def save_to_parquet(self, path: Union[Path, str]):
+        """Columnar alternative to `save_to_csv` (smaller and faster to load), requires pyarrow"""
+        data, constants = self._pack()
+        path = process_path(path)
+        pd.DataFrame(data).to_parquet(path.with_suffix('.parquet'), index=False)
+        self._save_constants(path, constants)
+
+    def save_to_feather(self, path: Union[Path, str]):
+        """Columnar alternative to `save_to_csv` (fastest to load with pandas), requires pyarrow"""
+        data, constants = self._pack()
+        path = process_path(path)
+        pd.DataFrame(data).to_feather(path.with_suffix('.feather'))
+        self._save_constants(path, constants)
+
+    @staticmethod
+    def _save_constants(path: Path, constants: Dict):
+        # the constants are saved next to the data file (path without suffix)
         json_path = path.parent / Path(f'{path.stem}_constants')
         json_path = json_path.with_suffix('.json')
         json_save(json_path, constants)
 
 
 def minimize_results(sim_results: List[SimulationResult]) -> JointSimulationResults:
-    # asserting that the length of all snapshots is the same
-    snapshot_len = len(sim_results[0].snapshot)
-    assert all(map(lambda x: len(x.snapshot) == snapshot_len, sim_results))
-
-    # finding the constant variables
-    constant_variables = tuple(set.intersection(*[set(r.snapshot) for r in sim_results]))
+    # a single result has nothing to compare with, i.e. all of its variables are constant
+    if len(sim_results) == 1:
+        return JointSimulationResults(
+            results=[SimulationResult(result=sim_results[0].result, snapshot=())],
+            constant_variables=sim_results[0].snapshot
+        )
+
+    # asserting that all snapshots have the same variables in the same order (the dynamic ones are picked by position)
+    names = [v.name for v in sim_results[0].snapshot]
+    assert all([v.name for v in r.snapshot] == names for r in sim_results), \
+        'All snapshots must have the same variables, sorted by name'
+
+    # finding the constant variables (the valued variables that appear in all snapshots)
+    counter = Counter()
+    for r in sim_results:
+        counter.update(r.snapshot)
+    constant_variables = tuple(v for v, count in counter.items() if count == len(sim_results))
     constant_variable_names = set(map(lambda x: x.name, constant_variables))
 
     # finding the dynamic variable names
     all_var_names = set(map(lambda x: x.name, sim_results[0].snapshot))
     dynamic_variable_names = all_var_names - constant_variable_names
 
+    # the dynamic variables are at the same positions in all the snapshots
+    dynamic_indices = [i for i, v in enumerate(sim_results[0].snapshot) if v.name in dynamic_variable_names]
+
     # merging dict of dynamic variables and results
     minimized_results = [SimulationResult(result=sim.result,
-                                          snapshot=tuple(filter(lambda x: x.name in dynamic_variable_names,
-                                                                sim.snapshot)))
+                                          snapshot=tuple(sim.snapshot[i] for i in dynamic_indices))
                          for sim in sim_results]
 
     # return a dict of constants and results with parameters
@@ -2,12 +2,11 @@ from dataclasses import dataclass, asdict
 from typing import Any, Tuple, Dict, List, Iterator, Union
 from ..variables.variables import ValuedVariable, snapshot_to_dict
 from collections import defaultdict
-from functools import reduce
 import json
 from pathlib import Path
 
 
-@dataclass
+@dataclass(slots=True)
 class SimulationResult:
     result: Dict[str, Any]
     snapshot: Tuple[ValuedVariable, ...]
@@ -30,10 +29,6 @@ def _merge_two_dicts(dict_a: Dict[str, Any], dict_b: Dict[str, Any]):
     return dict(**dict_a, **dict_b)
 
 
-def _merge_dicts(*dicts: Dict):
-    return reduce(_merge_two_dicts, dicts)
-
-
 def merge(sim_a: SimulationResult, sim_b: SimulationResult) -> SimulationResult:
     """Combine two simulation results with the same snapshot"""
     if sim_a.snapshot != sim_b.snapshot:
@@ -80,14 +75,19 @@ def join(*sims: Union[List[SimulationResult], List[List[SimulationResult]], Tupl
         # Handle case where multiple arguments are passed individually
         sims_list = list(sims)
 
-    # convert the list to dict
-    data = defaultdict(list)
+    # convert the list to dict, merging the results of each snapshot as they come
+    data = defaultdict(dict)
 
     # flatten the list into a single generator of `SimulationResult` (useful for, e.g., nested list)
     sims_list = flatten_lists_into_generator(sims_list)
 
     for sim in sims_list:
-        data[sim.snapshot].append(sim.result)  # type: ignore
-
-    return [SimulationResult(snapshot=snapshot,  # type: ignore
-                             result=reduce(_merge_dicts, results)) for snapshot, results in data.items()]
+        result = data[sim.snapshot]  # type: ignore
+        # same as `_merge_two_dicts`, results of the same snapshot must not share keys
+        common_keys = result.keys() & sim.result.keys()
+        if common_keys:
+            raise TypeError(f'Cannot join results of the same snapshot with common keys: {sorted(common_keys)}')
+        result.update(sim.result)
+
+    return [SimulationResult(snapshot=snapshot, result=result)  # type: ignore
+            for snapshot, result in data.items()]
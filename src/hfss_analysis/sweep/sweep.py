@@ -1,9 +1,11 @@
 from dataclasses import dataclass, field
-from typing import Tuple, List, Iterable, Dict, Set, Literal
+from typing import Tuple, List, Iterable, Dict, Set, Literal, Optional
+import numpy as np
 import pandas as pd
 from itertools import product
 from ..hfss_project import Project
-from ..variables.variables import ValuedVariable, round_and_sort_valued_variables, Variable
+from ..variables.variables import ValuedVariable, round_and_sort_valued_variables, sort_valued_variables, \
+    Variable
 
 
 @dataclass
@@ -16,14 +18,24 @@ class Sweep:
     dynamic_names: Set = None
     constant_parameters: Dict = field(default_factory=dict)
     results: pd.DataFrame = field(default_factory=pd.DataFrame)
+    _unified: Optional[List[Tuple[ValuedVariable, ...]]] = field(default=None, init=False, repr=False)
 
     def _create_parameters_dataframe(self) -> pd.DataFrame:
-
-        def _parse(variables: Iterable[ValuedVariable]) -> Dict[str, str]:
-            return {var.name: var.value for var in variables}
-
-        result = [_parse(variables) for variables in self.make_unify_iterable()]
-        return pd.DataFrame(result)
+        # the columns are built straight from the variables' values, without creating valued variables
+        variables = list(self.variables)
+        values = [variable.values() for variable in variables]
+        if self.strategy == 'product':
+            # same order as `itertools.product` (the last variable changes the fastest)
+            columns = [grid.ravel() for grid in np.meshgrid(*values, indexing='ij')]
+            length = int(np.prod([len(v) for v in values]))
+        elif self.strategy == 'zip':
+            length = min(map(len, values), default=0)
+            columns = [v[:length] for v in values]
+        else:
+            print(f'Unknown strategy: {self.strategy}!!!')
+            raise ValueError
+        return pd.DataFrame({variable.name: column for variable, column in zip(variables, columns)},
+                            index=pd.RangeIndex(length))
 
     def add_parameters(self, df: pd.DataFrame):
         parameters_df = self._create_parameters_dataframe()
@@ -32,6 +44,7 @@ class Sweep:
     def clear(self):
         self._parameters = []
         self._snapshots = []
+        self._unified = None
 
     def _set_parameters_and_get_snapshot(self, parameters: Tuple[ValuedVariable, ...]):
         # setting the parameters
@@ -64,27 +77,31 @@ class Sweep:
 
     def _create_parameters_and_snapshot(self):
         parameters_set = list(self.make_unify_iterable())
-        snapshot = self.project.get_snapshot()
+        # the values of the snapshot (and of the parameters, see `Variable.gen`) are already rounded
+        snapshot = round_and_sort_valued_variables(self.project.get_snapshot())
         for params in parameters_set:
-            # rounding and sorting
-            params = round_and_sort_valued_variables(params)
+            # sorting
+            params = sort_valued_variables(params)
             # adding to the parameters list
             self._parameters.append(params)
 
             # getting parameters names
-            names = set([p.name for p in params])
+            names = frozenset(p.name for p in params)
 
             # adding a snapshot of this parameters
-            snapshot_without_params = filter(lambda x: x.name not in names, snapshot)
-            snapshot = list(params) + list(snapshot_without_params)
-            self._snapshots.append(round_and_sort_valued_variables(snapshot))
+            snapshot_without_params = [v for v in snapshot if v.name not in names]
+            self._snapshots.append(sort_valued_variables(params + tuple(snapshot_without_params)))
 
     def make_unify_iterable(self) -> Iterable:
         """Convert the variables to a single iterable"""
-        iter_lst = [variable.gen() for variable in self.variables]
-        if self.strategy == 'product':
-            return product(*iter_lst)
-        if self.strategy == 'zip':
-            return zip(*iter_lst)
-        print(f'Unknown strategy: {self.strategy}!!!')
-        raise ValueError
+        # the valued variables are generated once and reused until `clear` is called
+        if self._unified is None:
+            iter_lst = [variable.gen() for variable in self.variables]
+            if self.strategy == 'product':
+                self._unified = list(product(*iter_lst))
+            elif self.strategy == 'zip':
+                self._unified = list(zip(*iter_lst))
+            else:
+                print(f'Unknown strategy: {self.strategy}!!!')
+                raise ValueError
+        return iter(self._unified)
@@ -1,4 +1,6 @@
 from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter
 from typing import Iterable, Union, Optional, Tuple, Dict
 import numpy as np
 
@@ -10,7 +12,7 @@ def add_units(value: Union[float, int], units: str) -> str:
     return f'{value}{units}'
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ValuedVariable:
     name: str
     value: float
@@ -28,7 +30,7 @@ def round_valued_variable(valued_var: ValuedVariable) -> ValuedVariable:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class Variable:
     name: str
     iterable: Iterable[float]  # values to sweep
@@ -40,18 +42,25 @@ class Variable:
     #     if self.display_name is None:
     #         self.display_name = self.design_name
 
+    def values(self) -> np.ndarray:
+        # rounding all the values at once (same result as `round_valued_variable` on each of them).
+        # note that a mix of integers and floats becomes a float array
+        return np.round(np.asarray(list(self.iterable)), decimals=ROUNDING_DIGIT)
+
     def gen(self) -> Iterable[ValuedVariable]:
-        for value in self.iterable:
-            v = ValuedVariable(
+        values = list(self.iterable)
+        rounded = np.round(np.asarray(values), decimals=ROUNDING_DIGIT).tolist()
+        for value, rounded_value in zip(values, rounded):
+            yield ValuedVariable(
                 name=self.name,
-                value=value,
+                # integers are unchanged by the rounding and kept as they are (e.g. 8 is set as '8mm', not '8.0mm')
+                value=value if isinstance(value, (int, np.integer)) else rounded_value,
                 unit=self.units,
             )
-            yield round_valued_variable(v)
 
 
 def sort_valued_variables(valued_vars: Iterable[ValuedVariable]) -> Tuple[ValuedVariable, ...]:
-    return tuple(sorted(valued_vars, key=lambda x: x.name))
+    return tuple(sorted(valued_vars, key=attrgetter('name')))
 
 
 def round_valued_variables(valued_vars: Iterable[ValuedVariable]) -> Iterable[ValuedVariable]:
@@ -62,8 +71,14 @@ def round_and_sort_valued_variables(valued_vars: Iterable[ValuedVariable]) -> Tu
     return sort_valued_variables(round_valued_variables(valued_vars))
 
 
+@lru_cache(maxsize=None)
+def _column_name(name: str, unit: str) -> str:
+    # sweeps repeat the same variables in many snapshots, hence the column names are formatted once
+    return f'{name} ({unit})'
+
+
 def snapshot_to_dict(snapshot: Tuple[ValuedVariable, ...]) -> Dict[str, float]:
-    return {f'{v.name} ({v.unit})': v.value for v in snapshot}
+    return {_column_name(v.name, v.unit): v.value for v in snapshot}
 
 # def sort_and_round_valued_vars(valued_vars: Iterable[ValuedVariable]) -> Tuple[ValuedVariable, ...]:
 #     return sort_valued_variables(round_valued_variables(valued_vars))
@@ -1,3 +1,4 @@
+import pandas as pd
 from hfss_analysis import classical_analysis
 
 modes_to_labels = {
@@ -111,3 +112,6 @@ def test_classical_formatter():
     assert result == expected
 
 
+def test_classical_formatter_dataframe():
+    result = classical_analysis.apply_format_dataframe(data, modes_to_labels=modes_to_labels)
+    assert result.equals(pd.DataFrame(expected))
@@ -0,0 +1,89 @@
+import math
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hfss_analysis.simulation_basics import minimize_results, SimulationResult
+from hfss_analysis.simulation_basics.joint_results import JointSimulationResults, process_path
+from hfss_analysis.variables.variables import ValuedVariable
+
+
+v_a = ValuedVariable('$LLLL', 11.015, 'mm')
+v_b = ValuedVariable('hiho', 8, '')
+v_c = ValuedVariable('hiho', 9, '')
+
+
+data = [
+    SimulationResult(result={'name': 'hi'}, snapshot=(v_a, v_b)),
+    SimulationResult(result={'name': 'bye'}, snapshot=(v_a, v_c)),
+]
+
+expected = JointSimulationResults(
+    results=[
+        SimulationResult(result={'name': 'hi'}, snapshot=(v_b,)),
+        SimulationResult(result={'name': 'bye'}, snapshot=(v_c,)),
+    ],
+    constant_variables=(v_a,)
+)
+
+data_not_aligned = [
+    SimulationResult(result={'name': 'hi'}, snapshot=(v_a, v_b)),
+    SimulationResult(result={'name': 'bye'}, snapshot=(v_c, v_a)),
+]
+
+v_d = ValuedVariable('hiho', 8.5, '')
+
+data_with_missing_values = JointSimulationResults(
+    results=[
+        SimulationResult(result={'name': 'hi', 'freq': 1.5}, snapshot=(v_b,)),
+        SimulationResult(result={'freq': math.nan, 'Q': 'high'}, snapshot=(v_c,)),
+        SimulationResult(result={'freq': np.float32('nan'), 'Q': pd.NA}, snapshot=(v_d,)),
+    ],
+    constant_variables=(v_a,)
+)
+
+expected_csv_lines = [
+    'hiho (),name,freq,Q',
+    '8,hi,1.5,',
+    '9,,,high',
+    '8.5,,,',
+]
+
+expected_single = JointSimulationResults(
+    results=[SimulationResult(result={'name': 'hi'}, snapshot=())],
+    constant_variables=(v_a, v_b)
+)
+
+
+def test_minimize_results():
+    result = minimize_results(data)
+    assert result == expected
+
+
+def test_minimize_single_result():
+    result = minimize_results(data[:1])
+    assert result == expected_single
+
+
+def test_minimize_not_aligned_results():
+    with pytest.raises(AssertionError):
+        minimize_results(data_not_aligned)
+
+
+def test_save_to_csv(tmp_path):
+    data_with_missing_values.save_to_csv(tmp_path / 'results.csv')
+    with open(tmp_path / 'results.csv') as f:
+        assert f.read().splitlines() == expected_csv_lines
+    assert (tmp_path / 'results_constants.json').exists()
+
+
+@pytest.mark.parametrize("path, expected", [
+    ('out/results', Path('out/results')),
+    ('out/results.csv', Path('out/results')),
+    ('results.tar.gz', Path('results')),
+    (Path('out.dir/results.csv'), Path('out.dir/results')),
+])
+def test_process_path(path, expected):
+    assert process_path(path) == expected
@@ -1,3 +1,5 @@
+import pytest
+
 from hfss_analysis.simulation_basics.simulation_result import join, SimulationResult
 from hfss_analysis.variables.variables import ValuedVariable
 
@@ -22,6 +24,11 @@ expected = [
                              'i_know_who_i_am': True}, snapshot=(v_a, v_c)),
 ]
 
+data_with_common_keys = [
+    SimulationResult(result={'name': 'hi', 'is_horse': True}, snapshot=(v_a, v_b)),
+    SimulationResult(result={'name': 'bye'}, snapshot=(v_a, v_b)),
+]
+
 
 def test_simulation_results_merge():
     result = join(data)
@@ -29,3 +36,8 @@ def test_simulation_results_merge():
 
     result = join(*data)
     assert(result == expected)
+
+
+def test_simulation_results_merge_common_keys():
+    with pytest.raises(TypeError):
+        join(data_with_common_keys)
@@ -0,0 +1,34 @@
+from itertools import product
+
+import pandas as pd
+from hfss_analysis import Sweep, Variable
+
+
+variables = [
+    Variable('length', [1, 2, 3], 'mm'),
+    Variable('width', [0.5, 1 / 3], 'mm'),
+    Variable('$gap', [10, 20, 30, 40], 'um'),
+]
+
+expected_product = pd.DataFrame(
+    list(product([1, 2, 3], [0.5, 0.3333333333], [10, 20, 30, 40])),
+    columns=['length', 'width', '$gap']
+)
+
+expected_zip = pd.DataFrame({'length': [1, 2], 'width': [0.5, 0.3333333333], '$gap': [10, 20]})
+
+
+def test_parameters_dataframe_product():
+    result = Sweep(project=None, variables=variables, strategy='product')._create_parameters_dataframe()
+    assert result.equals(expected_product)
+
+
+def test_parameters_dataframe_zip():
+    result = Sweep(project=None, variables=variables, strategy='zip')._create_parameters_dataframe()
+    assert result.equals(expected_zip)
+
+
+def test_parameters_dataframe_without_variables():
+    # the product of no variables is a single (empty) point
+    result = Sweep(project=None, variables=[], strategy='product')._create_parameters_dataframe()
+    assert result.shape == (1, 0)
@@ -1,5 +1,5 @@
 from hfss_analysis import ValuedVariable
-from hfss_analysis.variables.variables import ROUNDING_DIGIT, round_valued_variable
+from hfss_analysis.variables.variables import ROUNDING_DIGIT, round_valued_variable, Variable, snapshot_to_dict
 from hfss_analysis.hfss_project.variation_dict_helper import text_to_valued_variables, dict_to_valued_variables
 
 import numpy as np
@@ -21,6 +21,17 @@ def test_rounded_valued_variable(value):
     assert result == expected
 
 
+def test_variable_gen_keeps_integers():
+    result = [v.to_name_and_value() for v in Variable('length', [8, 8.5, 1 / 3], 'mm').gen()]
+    assert result == [('length', '8mm'), ('length', '8.5mm'), ('length', '0.3333333333mm')]
+
+
+def test_snapshot_to_dict_keeps_values():
+    # equal snapshots may hold values of different types (8 == 8.0), each keeps its own
+    assert repr(snapshot_to_dict((ValuedVariable('x', 8, 'mm'),))) == "{'x (mm)': 8}"
+    assert repr(snapshot_to_dict((ValuedVariable('x', 8.0, 'mm'),))) == "{'x (mm)': 8.0}"
+
+
 @pytest.mark.parametrize("text, expected", [
     ("length='8mm' $hole='11.015000000000001mm'",
      (ValuedVariable('$hole', 11.015, 'mm'), ValuedVariable('length', 8, 'mm'))),